@@ -0,0 +1,380 @@
+"""
+Microbenchmarks das partes puramente Python do bot: conversão das respostas
+da PandaScore, formatadores de mensagens e os filtros "a FURIA joga?".
+
+Gera payloads sintéticos no formato da PandaScore (1k a 100k partidas, feeds
+grandes), mede o tempo de cada função (melhor e mediana de N repetições) e as
+alocações com tracemalloc (pico e memória retida), e grava o resultado em JSON
+para comparar commits.
+
+Uso:
+    python benchmark_formatadores.py --saida antes.json
+    python benchmark_formatadores.py --tamanhos 1000 10000 --comparar antes.json
+    python benchmark_formatadores.py --filtro format_match   # Só alguns casos
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Callable
+
+# As constantes de ajuste são lidas na importação: dados em diretório temporário
+os.environ.setdefault("FURIOSA_DATA_DIR", tempfile.mkdtemp(prefix="furiosa-bench-"))
+os.environ.setdefault("TRACING_ATIVO", "0")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import logging  # noqa: E402
+
+import furiosa_bot as fb  # noqa: E402
+
+logging.getLogger().setLevel(logging.WARNING)
+
+STATUS = ("not_started", "running", "finished")
+LIGAS = ("ESL Pro League", "BLAST Premier", "PGL Major", "IEM Katowice", "CBCS")
+NOMES_TIMES = (
+    "NAVI",
+    "Vitality",
+    "MOUZ",
+    "G2",
+    "paiN",
+    "MIBR",
+    "Imperial",
+    "Team Liquid",
+)
+JOGADORES = ("yuurih", "KSCERATO", "FalleN", "molodoy", "YEKINDAR", "sidde", "Hepa")
+NACIONALIDADES = ("BR", "KZ", "LV", "AR", None)
+
+
+# --- Payloads sintéticos (formato das respostas da PandaScore) ---
+
+
+def _data_iso(base: datetime.datetime, horas: float) -> str:
+    return (base + datetime.timedelta(hours=horas)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def gerar_partidas_json(quantidade: int, aleatorio: random.Random) -> list[dict]:
+    """Partidas com ~1 em 20 da FURIA, campos opcionais às vezes ausentes."""
+    base = datetime.datetime(2025, 1, 1)
+    partidas = []
+    for i in range(quantidade):
+        status = aleatorio.choice(STATUS)
+        furia = aleatorio.random() < 0.05
+        id_a = fb.FURIA_TEAM_ID if furia else 1000 + aleatorio.randrange(5000)
+        id_b = 1000 + aleatorio.randrange(5000)
+        nome_a = "FURIA" if furia else aleatorio.choice(NOMES_TIMES)
+        nome_b = aleatorio.choice(NOMES_TIMES)
+        oponentes = [
+            {"opponent": {"id": id_a, "name": nome_a, "acronym": nome_a[:4]}},
+            {"opponent": {"id": id_b, "name": nome_b, "acronym": nome_b[:4]}},
+        ]
+        if aleatorio.random() < 0.03:
+            oponentes = oponentes[:1]  # Chave ainda sem adversário definido
+        inicio = aleatorio.uniform(-5000, 5000)
+        partidas.append(
+            {
+                "id": 900000 + i,
+                "name": f"Upper bracket: {nome_a} vs {nome_b}",
+                "status": status,
+                "begin_at": _data_iso(base, inicio),
+                "end_at": (
+                    _data_iso(base, inicio + 2) if status == "finished" else None
+                ),
+                "number_of_games": aleatorio.choice((1, 3, 5)),
+                "games": [
+                    {"position": p, "status": "running" if p == 2 else "finished"}
+                    for p in range(1, 3)
+                ],
+                "opponents": oponentes,
+                "results": [
+                    {"team_id": id_a, "score": aleatorio.randrange(3)},
+                    {"team_id": id_b, "score": aleatorio.randrange(3)},
+                ],
+                "league": {"id": 4000 + i % 50, "name": aleatorio.choice(LIGAS)},
+                "serie": (
+                    {"full_name": f"Season {i % 30} 2025"}
+                    if aleatorio.random() < 0.9
+                    else None
+                ),
+                "winner_id": (
+                    aleatorio.choice((id_a, id_b)) if status == "finished" else None
+                ),
+            }
+        )
+    return partidas
+
+
+def gerar_torneios_json(quantidade: int, aleatorio: random.Random) -> list[dict]:
+    base = datetime.datetime(2025, 1, 1)
+    return [
+        {
+            "id": 500000 + i,
+            "name": f"Playoffs {i}",
+            "serie": {"full_name": f"{aleatorio.choice(LIGAS)} Season {i % 30}"},
+            "tier": aleatorio.choice(("s", "a", "b", "c", None)),
+            "begin_at": _data_iso(base, i),
+            "end_at": _data_iso(base, i + 240) if aleatorio.random() < 0.8 else None,
+        }
+        for i in range(quantidade)
+    ]
+
+
+def gerar_equipe_json(quantidade: int, aleatorio: random.Random) -> dict:
+    return {
+        "id": fb.FURIA_TEAM_ID,
+        "name": "FURIA",
+        "players": [
+            {
+                "name": "guerri" if i == 0 else f"{aleatorio.choice(JOGADORES)}{i}",
+                "nationality": aleatorio.choice(NACIONALIDADES),
+                "active": aleatorio.random() < 0.7,
+            }
+            for i in range(quantidade)
+        ],
+    }
+
+
+def gerar_feed(quantidade: int, aleatorio: random.Random) -> Any:
+    """Imita o resultado do feedparser (.feed e .entries) com ~1/3 sobre a FURIA."""
+    entradas = []
+    for i in range(quantidade):
+        titulo = (
+            f"FURIA vence {aleatorio.choice(NOMES_TIMES)} e avança"
+            if aleatorio.random() < 0.33
+            else f"{aleatorio.choice(NOMES_TIMES)} anuncia novo jogador"
+        )
+        publicado = time.gmtime(1735689600 + i * 600)
+        entradas.append(
+            {
+                "id": f"https://www.hltv.org/news/{i}",
+                "link": f"https://www.hltv.org/news/{i}",
+                "title": titulo,
+                "summary": "Texto da notícia " * 20,
+                "published_parsed": publicado,
+            }
+        )
+    return SimpleNamespace(feed={"title": "HLTV.org"}, entries=entradas)
+
+
+def noticias_do_armazem(feed: Any) -> list[dict]:
+    """Notícias já no formato guardado pelo ArmazemNoticias."""
+    return [
+        {
+            "title": e["title"],
+            "link": e["link"],
+            "published": list(e["published_parsed"][:6]),
+            "source": feed.feed["title"],
+        }
+        for e in feed.entries
+    ]
+
+
+# --- Casos medidos ---
+
+
+def montar_casos(tamanho: int, semente: int) -> list[tuple[str, int, Callable]]:
+    """
+    (nome, itens processados, função sem argumentos) para um tamanho de payload.
+    Cada função percorre o payload inteiro, como os laços do bot.
+    """
+    aleatorio = random.Random(semente)
+    partidas_json = gerar_partidas_json(tamanho, aleatorio)
+    partidas = fb.lista_de_partidas(partidas_json)
+    finalizadas = [p for p in partidas if p.status == "finished"]
+    torneios = fb.lista_de_torneios(gerar_torneios_json(tamanho, aleatorio))
+    feed = gerar_feed(tamanho, aleatorio)
+    noticias = noticias_do_armazem(feed)
+    equipe = fb.Equipe.de_json(gerar_equipe_json(min(tamanho, 1000), aleatorio))
+    caminho_db = os.path.join(fb.DATA_DIR, f"bench-{tamanho}.db")
+
+    def ingerir_feed() -> list[dict]:
+        # Armazém novo a cada vez: todas as entradas são inéditas
+        if os.path.exists(caminho_db):
+            os.remove(caminho_db)
+        armazem = fb.ArmazemNoticias(caminho_db, max_itens=tamanho)
+        try:
+            return armazem.ingerir("https://www.hltv.org/rss/news", feed)
+        finally:
+            armazem.fechar()
+
+    return [
+        ("lista_de_partidas", tamanho, lambda: fb.lista_de_partidas(partidas_json)),
+        (
+            "format_match_data_geral",
+            len(partidas),
+            lambda: [fb.format_match_data_geral(p) for p in partidas],
+        ),
+        (
+            "format_last_match_result",
+            len(finalizadas),
+            lambda: [fb.format_last_match_result(p) for p in finalizadas],
+        ),
+        (
+            "format_tournament_data",
+            len(torneios),
+            lambda: [fb.format_tournament_data(t) for t in torneios],
+        ),
+        (
+            "format_news_article",
+            len(noticias),
+            lambda: [fb.format_news_article(n) for n in noticias],
+        ),
+        (
+            "formatar_lineup_texto",
+            len(equipe.jogadores),
+            lambda: fb.formatar_lineup_texto(equipe),
+        ),
+        # Laço de buscar_proximos_jogos_furia (partidas já convertidas)
+        (
+            "filtro_furia_partidas",
+            len(partidas),
+            lambda: [p for p in partidas if fb.partida_tem_furia(p)],
+        ),
+        # Laço de HistoricoPartidasFuria.sincronizar (JSON cru da paginação)
+        (
+            "filtro_furia_json",
+            tamanho,
+            lambda: [
+                j for j in partidas_json if fb.FURIA_TEAM_ID in fb.ids_oponentes(j)
+            ],
+        ),
+        ("armazem_noticias_ingerir", tamanho, ingerir_feed),
+    ]
+
+
+def medir_tempo(funcao: Callable, repeticoes: int) -> list[float]:
+    """Tempos (s) de cada repetição, com o GC desligado como no timeit."""
+    funcao()  # Aquecimento (imports tardios, caches de strftime etc.)
+    tempos = []
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+    finally:
+        if gc_ativo:
+            gc.enable()
+    return tempos
+
+
+def medir_memoria(funcao: Callable) -> tuple[int, int]:
+    """(pico alocado, memória retida pelo resultado) em bytes, via tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        resultado = funcao()
+        depois, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return pico - antes, depois - antes
+
+
+def executar_caso(nome: str, itens: int, funcao: Callable, repeticoes: int) -> dict:
+    tempos = medir_tempo(funcao, repeticoes)
+    pico, retida = medir_memoria(funcao)
+    melhor = min(tempos)
+    return {
+        "caso": nome,
+        "itens": itens,
+        "melhor_s": round(melhor, 6),
+        "mediana_s": round(statistics.median(tempos), 6),
+        "ns_por_item": round(melhor / itens * 1e9, 1) if itens else None,
+        "pico_bytes": pico,
+        "retida_bytes": retida,
+    }
+
+
+def versao_git() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def imprimir_tabela(resultados: list[dict], anterior: dict | None) -> None:
+    linhas_anteriores = {
+        (r["caso"], r["tamanho"]): r for r in (anterior or {}).get("resultados", [])
+    }
+    cabecalho = f"{'caso':<28}{'tamanho':>9}{'melhor (ms)':>13}{'ns/item':>10}{'pico (KiB)':>12}"
+    if anterior:
+        cabecalho += f"{'vs anterior':>13}"
+    print(cabecalho)
+    for r in resultados:
+        linha = (
+            f"{r['caso']:<28}{r['tamanho']:>9}{r['melhor_s'] * 1000:>13.2f}"
+            f"{r['ns_por_item'] or 0:>10.0f}{r['pico_bytes'] / 1024:>12.0f}"
+        )
+        antes = linhas_anteriores.get((r["caso"], r["tamanho"]))
+        if antes and antes["melhor_s"]:
+            linha += f"{r['melhor_s'] / antes['melhor_s']:>12.2f}x"
+        print(linha)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--tamanhos", type=int, nargs="+", default=[1_000, 10_000, 100_000]
+    )
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--semente", type=int, default=2025)
+    parser.add_argument("--filtro", help="Só roda os casos cujo nome contém o texto")
+    parser.add_argument("--saida", help="Arquivo JSON com o resultado")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anterior = json.load(arquivo)
+
+    resultados = []
+    for tamanho in args.tamanhos:
+        for nome, itens, funcao in montar_casos(tamanho, args.semente):
+            if args.filtro and args.filtro not in nome:
+                continue
+            resultado = executar_caso(nome, itens, funcao, args.repeticoes)
+            resultado["tamanho"] = tamanho
+            resultados.append(resultado)
+            print(
+                f"{nome} ({tamanho}): {resultado['melhor_s'] * 1000:.2f} ms",
+                file=sys.stderr,
+            )
+
+    imprimir_tabela(resultados, anterior)
+    if args.saida:
+        saida = {
+            "commit": versao_git(),
+            "data": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "repeticoes": args.repeticoes,
+            "semente": args.semente,
+            "resultados": resultados,
+        }
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(saida, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
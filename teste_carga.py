@@ -0,0 +1,479 @@
+"""
+Teste de carga de ponta a ponta do Furiosa Bot.
+
+Sobe servidores locais que imitam a PandaScore, o feed RSS da HLTV e a Bot API
+do Telegram (com latência configurável), troca o Dialogflow por um substituto
+local, monta a Application real (construir_aplicacao, os mesmos handlers do
+main()) e injeta milhares de Updates sintéticos: comandos e texto livre.
+
+Mede vazão, latência da resposta (p50/p95/p99, do Update até o Telegram
+confirmar a última mensagem) e chamadas aos upstreams por update.
+
+Uso:
+    python teste_carga.py --updates 2000 --concorrencia 100 --latencia-pandascore-ms 150
+    python teste_carga.py --updates-simultaneos 64   # Testa outro UPDATES_SIMULTANEOS
+    python teste_carga.py --saida resultado.json   # Resultado em JSON para comparar commits
+"""
+
+import argparse
+import asyncio
+import datetime
+import importlib
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import Counter
+
+from aiohttp import web
+
+TOKEN_TESTE = "123456:CARGA-LOCAL"
+FURIA_TEAM_ID = 124530  # Mesmo id usado pelo bot
+
+COMANDOS = [
+    "/start",
+    "/help",
+    "/proximo_jogo",
+    "/ultimojogo",
+    "/jogos_hoje",
+    "/campeonatos",
+    "/noticias",
+    "/line_up",
+    "/stats 2022",
+    "/social",
+    "/aovivo",
+]
+# Texto que o classificador local não reconhece: vai para o Dialogflow
+TEXTOS_DESCONHECIDOS = [
+    "e aí, como tá o cenário?",
+    "quem ganhou ontem no major",
+    "a furia vai pro mundial?",
+    "manda a tabela do campeonato",
+]
+
+
+def montar_argumentos() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument(
+        "--concorrencia",
+        type=int,
+        default=100,
+        help="Updates entregues ao bot ao mesmo tempo (a fila de chegada)",
+    )
+    parser.add_argument(
+        "--updates-simultaneos",
+        type=int,
+        help="UPDATES_SIMULTANEOS do bot (padrão: o da configuração)",
+    )
+    parser.add_argument(
+        "--proporcao-texto",
+        type=float,
+        default=0.3,
+        help="Fração dos updates que é texto livre (o resto são comandos)",
+    )
+    parser.add_argument("--latencia-pandascore-ms", type=float, default=120)
+    parser.add_argument("--latencia-rss-ms", type=float, default=200)
+    parser.add_argument("--latencia-dialogflow-ms", type=float, default=80)
+    parser.add_argument("--latencia-telegram-ms", type=float, default=40)
+    parser.add_argument(
+        "--limites-telegram",
+        action="store_true",
+        help="Mantém os limites reais de envio do Telegram (senão ficam bem altos)",
+    )
+    parser.add_argument("--semente", type=int, default=2025)
+    parser.add_argument("--saida", help="Arquivo JSON com o resultado")
+    return parser.parse_args()
+
+
+# --- Dados sintéticos no formato da PandaScore ---
+
+
+def _time(id_time: int, nome: str) -> dict:
+    return {"opponent": {"id": id_time, "name": nome}}
+
+
+def gerar_partidas(status: str, quantidade: int, agora: datetime.datetime) -> list:
+    """Ordenadas como a PandaScore devolve: próximas por begin_at, passadas por -end_at."""
+    partidas = []
+    for i in range(quantidade):
+        furia = i % 7 == 0  # Algumas partidas são da FURIA
+        id_a = FURIA_TEAM_ID if furia else 1000 + i
+        deslocamento = datetime.timedelta(hours=i + 1)
+        inicio = (
+            agora - deslocamento if status != "not_started" else agora + deslocamento
+        )
+        partidas.append(
+            {
+                "id": {"running": 1, "not_started": 2, "finished": 3}[status] * 100000
+                + i,
+                "name": f"Partida {i}",
+                "status": status,
+                "begin_at": inicio.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "end_at": (
+                    (inicio + datetime.timedelta(hours=2)).strftime(
+                        "%Y-%m-%dT%H:%M:%SZ"
+                    )
+                    if status == "finished"
+                    else None
+                ),
+                "number_of_games": 3,
+                "games": [{"position": 1, "status": "running"}],
+                "opponents": [
+                    _time(id_a, "FURIA" if furia else f"Time {id_a}"),
+                    _time(2000 + i, f"Time {2000 + i}"),
+                ],
+                "results": [
+                    {"team_id": id_a, "score": i % 3},
+                    {"team_id": 2000 + i, "score": (i + 1) % 3},
+                ],
+                "league": {"name": "ESL Pro League"},
+                "serie": {"full_name": "Season 21"},
+                "winner_id": id_a if status == "finished" else None,
+            }
+        )
+    return partidas
+
+
+def gerar_torneios(quantidade: int, agora: datetime.datetime) -> list:
+    return [
+        {
+            "id": 500 + i,
+            "name": f"Torneio {i}",
+            "serie": {"full_name": f"Série {i} 2025"},
+            "tier": "s" if i % 2 else "a",
+            "begin_at": (agora - datetime.timedelta(days=i)).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+            "end_at": (agora + datetime.timedelta(days=10 + i)).strftime(
+                "%Y-%m-%dT%H:%M:%SZ"
+            ),
+        }
+        for i in range(quantidade)
+    ]
+
+
+def gerar_time() -> dict:
+    jogadores = ["yuurih", "KSCERATO", "FalleN", "molodoy", "YEKINDAR", "skullz"]
+    return {
+        "id": FURIA_TEAM_ID,
+        "name": "FURIA",
+        "players": [
+            {"name": nome, "nationality": "BR", "active": i < 5}
+            for i, nome in enumerate(jogadores)
+        ],
+    }
+
+
+def gerar_feed_rss(quantidade: int = 60) -> bytes:
+    itens = []
+    for i in range(quantidade):
+        data = datetime.datetime(2025, 1, 1) + datetime.timedelta(hours=i)
+        titulo = f"FURIA anuncia novidade {i}" if i % 3 == 0 else f"Notícia geral {i}"
+        itens.append(
+            f"<item><title>{titulo}</title><link>https://www.hltv.org/news/{i}</link>"
+            f"<guid>{i}</guid><pubDate>{data.strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate>"
+            f"<description>Texto da notícia {i}</description></item>"
+        )
+    return (
+        '<?xml version="1.0"?><rss version="2.0"><channel><title>HLTV</title>'
+        + "".join(itens)
+        + "</channel></rss>"
+    ).encode()
+
+
+# --- Servidores locais ---
+
+
+class Servidores:
+    """PandaScore, RSS e Bot API do Telegram locais, contando as requisições."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.args = args
+        self.chamadas: Counter = Counter()
+        self._runners: list[web.AppRunner] = []
+        self._proximo_message_id = 0
+        agora = datetime.datetime.now(datetime.timezone.utc)
+        self._dados = {
+            "/csgo/matches/running": gerar_partidas("running", 12, agora),
+            "/csgo/matches/upcoming": gerar_partidas("not_started", 200, agora),
+            "/csgo/matches/past": gerar_partidas("finished", 200, agora),
+            "/csgo/tournaments/running": gerar_torneios(8, agora),
+            "/csgo/tournaments/upcoming": gerar_torneios(8, agora),
+        }
+        self._feed = gerar_feed_rss()
+
+    async def _subir(self, app: web.Application) -> str:
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        self._runners.append(runner)
+        porta = site._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{porta}"
+
+    async def iniciar(self) -> dict:
+        pandascore = web.Application()
+        pandascore.router.add_get("/{caminho:.*}", self._pandascore)
+        rss = web.Application()
+        rss.router.add_get("/rss/news", self._rss)
+        telegram = web.Application()
+        telegram.router.add_post("/bot{token}/{metodo}", self._telegram)
+        return {
+            "pandascore": await self._subir(pandascore),
+            "rss": await self._subir(rss) + "/rss/news",
+            "telegram": await self._subir(telegram) + "/bot",
+        }
+
+    async def parar(self) -> None:
+        for runner in self._runners:
+            await runner.cleanup()
+
+    async def _pandascore(self, request: web.Request) -> web.Response:
+        self.chamadas["pandascore"] += 1
+        await asyncio.sleep(self.args.latencia_pandascore_ms / 1000)
+        caminho = request.path
+        if caminho.startswith("/teams/"):
+            return web.json_response(gerar_time())
+        if caminho.startswith("/matches/"):
+            partida = dict(self._dados["/csgo/matches/past"][0])
+            partida["id"] = int(caminho.rsplit("/", 1)[-1])
+            return web.json_response(partida)
+        dados = self._dados.get(caminho)
+        if dados is None:
+            return web.json_response({"error": "not found"}, status=404)
+        # Sincronização incremental do histórico: range[end_at]=desde,ate
+        intervalo = request.query.get("range[end_at]")
+        if intervalo:
+            desde, ate = intervalo.split(",")
+            dados = [p for p in dados if p["end_at"] and desde <= p["end_at"] <= ate]
+        # Mesmos parâmetros de paginar_pandascore; depois da última página, lista vazia
+        tamanho = int(request.query.get("page[size]", 50))
+        pagina = int(request.query.get("page[number]", 1))
+        return web.json_response(dados[(pagina - 1) * tamanho : pagina * tamanho])
+
+    async def _rss(self, request: web.Request) -> web.Response:
+        self.chamadas["rss"] += 1
+        await asyncio.sleep(self.args.latencia_rss_ms / 1000)
+        etag = '"feed-v1"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.Response(
+            body=self._feed, content_type="application/rss+xml", headers={"ETag": etag}
+        )
+
+    async def _telegram(self, request: web.Request) -> web.Response:
+        metodo = request.match_info["metodo"]
+        self.chamadas[f"telegram.{metodo}"] += 1
+        if request.content_type == "application/json":
+            parametros = await request.json()
+        else:
+            parametros = dict(await request.post())
+        if metodo == "getMe":
+            resultado = {
+                "id": 1,
+                "is_bot": True,
+                "first_name": "Furiosa",
+                "username": "furiosa_carga_bot",
+            }
+        elif metodo in ("sendMessage", "editMessageText"):
+            await asyncio.sleep(self.args.latencia_telegram_ms / 1000)
+            self._proximo_message_id += 1
+            chat_id = int(parametros.get("chat_id", 0))
+            resultado = {
+                "message_id": int(
+                    parametros.get("message_id", self._proximo_message_id)
+                ),
+                "date": int(time.time()),
+                "chat": {"id": chat_id, "type": "private"},
+                "text": parametros.get("text", ""),
+            }
+        else:  # answerInlineQuery, setWebhook, deleteWebhook...
+            resultado = True
+        return web.json_response({"ok": True, "result": resultado})
+
+
+# --- Updates sintéticos ---
+
+
+def gerar_updates(args: argparse.Namespace, frases: list[str]) -> list[dict]:
+    aleatorio = random.Random(args.semente)
+    updates = []
+    for i in range(args.updates):
+        chat_id = 10_000 + i  # Um usuário por update: sem esperar o limite por chat
+        if aleatorio.random() < args.proporcao_texto:
+            texto = aleatorio.choice(
+                frases if aleatorio.random() < 0.8 else TEXTOS_DESCONHECIDOS
+            )
+            entidades = []
+        else:
+            texto = aleatorio.choice(COMANDOS)
+            entidades = [
+                {"type": "bot_command", "offset": 0, "length": len(texto.split()[0])}
+            ]
+        updates.append(
+            {
+                "update_id": i + 1,
+                "message": {
+                    "message_id": i + 1,
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "from": {"id": chat_id, "is_bot": False, "first_name": f"Fã {i}"},
+                    "text": texto,
+                    "entities": entidades,
+                },
+            }
+        )
+    return updates
+
+
+def percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(len(ordenados) * p))]
+
+
+async def executar(args: argparse.Namespace) -> dict:
+    servidores = Servidores(args)
+    enderecos = await servidores.iniciar()
+
+    # O bot lê a configuração do ambiente na importação
+    os.environ.update(
+        {
+            "TELEGRAM_BOT_TOKEN": TOKEN_TESTE,
+            "PANDASCORE_API_KEY": "chave-local",
+            "PANDASCORE_BASE_URL": enderecos["pandascore"],
+            "GOOGLE_PROJECT_ID": "carga-local",
+            "FURIOSA_DATA_DIR": tempfile.mkdtemp(prefix="furiosa-carga-"),
+            "HTTP_ATIVO": "0",
+            "TRACING_ATIVO": "0",
+        }
+    )
+    if args.updates_simultaneos is not None:
+        os.environ["UPDATES_SIMULTANEOS"] = str(args.updates_simultaneos)
+    if not args.limites_telegram:
+        os.environ.setdefault("TELEGRAM_ENVIOS_POR_SEGUNDO", "100000")
+        os.environ.setdefault("FILA_ENVIO_TRABALHADORES", str(args.concorrencia))
+    fb = importlib.import_module("furiosa_bot")
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    fb.RSS_FEEDS.clear()
+    fb.RSS_FEEDS["HLTV"] = enderecos["rss"]
+
+    # Substituto local do Dialogflow (gRPC): mesma assinatura e mesma métrica
+    intencoes = json.load(
+        open(os.path.join(os.path.dirname(__file__), "frases_treino.json"))
+    )
+
+    async def dialogflow_local(project_id, session_id, text, language_code="pt-br"):
+        servidores.chamadas["dialogflow"] += 1
+        with fb.metricas.medir("furiosa_upstream_segundos", fb.ROTULOS_DIALOGFLOW):
+            await asyncio.sleep(args.latencia_dialogflow_ms / 1000)
+        palavras = set(fb.normalizar_texto(text).split())
+        melhor = max(
+            intencoes,
+            key=lambda nome: max(
+                len(palavras & set(fb.normalizar_texto(f).split()))
+                for f in intencoes[nome]
+            ),
+        )
+        return melhor, {}
+
+    async def sem_aquecimento() -> None:
+        return None
+
+    fb.detect_intent_text = dialogflow_local
+    fb.aquecer_dialogflow = sem_aquecimento
+
+    application = fb.construir_aplicacao(base_url=enderecos["telegram"])
+    inicio_boot = time.perf_counter()
+    await application.initialize()
+    await application.post_init(application)
+    await application.start()
+    tempo_boot = time.perf_counter() - inicio_boot
+    chamadas_boot = Counter(servidores.chamadas)
+
+    frases = [f for lista in intencoes.values() for f in lista]
+    updates = [
+        fb.Update.de_json(dados, application.bot)
+        for dados in gerar_updates(args, frases)
+    ]
+    latencias: list[float] = []
+    erros = Counter()
+    limite = asyncio.Semaphore(args.concorrencia)
+
+    async def processar(update) -> None:
+        async with limite:
+            inicio = time.perf_counter()
+            try:
+                # Passa pelo update_processor, como o polling e o webhook: o
+                # limite de updates simultâneos do bot vale também na carga
+                await application.update_processor.process_update(
+                    update, application.process_update(update)
+                )
+            except Exception as exc:
+                erros[type(exc).__name__] += 1
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(processar(u) for u in updates))
+    duracao = time.perf_counter() - inicio
+    chamadas_carga = Counter(servidores.chamadas)
+    chamadas_carga.subtract(chamadas_boot)
+
+    await application.stop()
+    await application.post_shutdown(application)
+    await application.shutdown()
+    await servidores.parar()
+
+    total = len(updates)
+    return {
+        "updates": total,
+        "concorrencia": args.concorrencia,
+        "updates_simultaneos": application.update_processor.max_concurrent_updates,
+        "latencias_upstream_ms": {
+            "pandascore": args.latencia_pandascore_ms,
+            "rss": args.latencia_rss_ms,
+            "dialogflow": args.latencia_dialogflow_ms,
+            "telegram": args.latencia_telegram_ms,
+        },
+        "inicializacao_s": round(tempo_boot, 3),
+        "fases_inicializacao_s": {
+            fase: round(segundos, 3)
+            for fase, segundos in fb.TEMPOS_INICIALIZACAO.items()
+        },
+        "duracao_s": round(duracao, 3),
+        "vazao_updates_s": round(total / duracao, 1) if duracao else 0.0,
+        "latencia_ms": {
+            "p50": round(percentil(latencias, 0.50), 1),
+            "p95": round(percentil(latencias, 0.95), 1),
+            "p99": round(percentil(latencias, 0.99), 1),
+            "max": round(max(latencias, default=0.0), 1),
+        },
+        "erros": dict(erros),
+        # Inclui as atualizações em segundo plano que rodaram durante a carga
+        "chamadas_por_update": {
+            nome: round(quantidade / total, 4)
+            for nome, quantidade in sorted(chamadas_carga.items())
+            if quantidade
+        },
+        "chamadas_na_inicializacao": dict(chamadas_boot),
+    }
+
+
+def main() -> None:
+    args = montar_argumentos()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    resultado = asyncio.run(executar(args))
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(resultado, arquivo, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Testes do servidor HTTP do modo webhook (receber_webhook e /saude), com
+Updates sintéticos no formato JSON que o Telegram envia.
+
+Uso:
+    python -m pytest -q tests
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("FURIOSA_DATA_DIR", tempfile.mkdtemp(prefix="furiosa-testes-"))
+
+import furiosa_bot as fb  # noqa: E402
+from telegram.ext import Application  # noqa: E402
+
+SEGREDO = "segredo-de-teste"
+
+UPDATE_VALIDO = {
+    "update_id": 1001,
+    "message": {
+        "message_id": 7,
+        "date": 1714000000,
+        "chat": {"id": 42, "type": "private", "first_name": "Torcedor"},
+        "from": {"id": 42, "is_bot": False, "first_name": "Torcedor"},
+        "text": "/proximojogo",
+        "entities": [{"type": "bot_command", "offset": 0, "length": 12}],
+    },
+}
+
+
+@pytest.fixture
+def application(monkeypatch) -> Application:
+    monkeypatch.setattr(fb, "BOT_MODO", "webhook")
+    monkeypatch.setattr(fb, "WEBHOOK_SEGREDO", SEGREDO)
+    return Application.builder().token("123456:TESTE").updater(None).build()
+
+
+def requisitar(application: Application, metodo: str, caminho: str, **kwargs):
+    """Faz uma requisição ao app aiohttp do bot e devolve (status, corpo)."""
+
+    async def executar():
+        async with TestClient(TestServer(fb.montar_app_http(application))) as cliente:
+            resposta = await cliente.request(metodo, caminho, **kwargs)
+            return resposta.status, await resposta.text()
+
+    return asyncio.run(executar())
+
+
+def cabecalho(segredo: str) -> dict:
+    return {"X-Telegram-Bot-Api-Secret-Token": segredo}
+
+
+@pytest.mark.parametrize("cabecalhos", [{}, cabecalho("errado")])
+def test_webhook_recusa_segredo_invalido(application, cabecalhos):
+    status, _ = requisitar(
+        application, "POST", fb.WEBHOOK_CAMINHO, json=UPDATE_VALIDO, headers=cabecalhos
+    )
+    assert status == 403
+    assert application.update_queue.empty()
+
+
+@pytest.mark.parametrize(
+    "corpo",
+    ["não é json", "[1, 2]", '{"message": {}}', '{"update_id": 1, "message": "oi"}'],
+)
+def test_webhook_recusa_corpo_invalido(application, corpo):
+    status, _ = requisitar(
+        application,
+        "POST",
+        fb.WEBHOOK_CAMINHO,
+        data=corpo,
+        headers={**cabecalho(SEGREDO), "Content-Type": "application/json"},
+    )
+    assert status == 400
+    assert application.update_queue.empty()
+
+
+def test_webhook_enfileira_update_valido(application):
+    status, _ = requisitar(
+        application,
+        "POST",
+        fb.WEBHOOK_CAMINHO,
+        json=UPDATE_VALIDO,
+        headers=cabecalho(SEGREDO),
+    )
+    assert status == 200
+    update = application.update_queue.get_nowait()
+    assert update.update_id == 1001
+    assert update.effective_chat.id == 42
+    assert update.message.text == "/proximojogo"
+
+
+def test_saude_responde(application):
+    status, corpo = requisitar(application, "GET", "/saude")
+    assert status == 200
+    assert '"status": "iniciando"' in corpo
+    assert '"modo": "webhook"' in corpo